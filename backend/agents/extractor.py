@@ -24,12 +24,25 @@ class PDFExtractionAgent:
         raw_text = structured["raw_text"]
         chapters = structured["chapters"]
 
-        # Clean chapter content
-        for ch in chapters:
-            ch["content"] = clean_text(ch.get("content", ""))
+        # Clean each chapter once and assemble the document-level clean
+        # text from the cleaned chapters, instead of running clean_text
+        # over the whole raw_text a second time. The preamble (content
+        # before the first heading) and the heading lines themselves are
+        # included so nothing from the raw text is lost.
+        cleaned_chapters = [clean_text(ch.get("content", "")) for ch in chapters]
+        for ch, cleaned in zip(chapters, cleaned_chapters):
+            ch["content"] = cleaned
+
+        pieces = []
+        preamble = clean_text(structured.get("preamble", ""))
+        if preamble:
+            pieces.append(preamble)
+        for ch, cleaned in zip(chapters, cleaned_chapters):
+            title = clean_text(ch.get("title", ""))
+            pieces.append(f"{title}\n{cleaned}" if title else cleaned)
 
         return {
             "raw_text": raw_text,
-            "clean_text": clean_text(raw_text),
+            "clean_text": "\n\n".join(pieces),
             "chapters": chapters,
         }
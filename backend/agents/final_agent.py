@@ -2,15 +2,36 @@
 
 Combines outputs from all agents into a single nicely formatted
 PDF study pack with table of contents.
+
+Rendering uses reportlab (C-accelerated text measurement and compressed
+content streams) when available, falling back to the original pure-Python
+fpdf layout otherwise.
 """
 
 from __future__ import annotations
 
+from functools import lru_cache
 from io import BytesIO
 from typing import List, Dict, Any
+from xml.sax.saxutils import escape
 
 from fpdf import FPDF
 
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import mm
+    from reportlab.platypus import (
+        PageBreak,
+        Paragraph,
+        SimpleDocTemplate,
+        Spacer,
+    )
+
+    _HAS_REPORTLAB = True
+except ImportError:  # pragma: no cover - reportlab is optional
+    _HAS_REPORTLAB = False
+
 
 class _StudyPackPDF(FPDF):
     """Custom PDF class for the study pack layout."""
@@ -27,37 +48,67 @@ class _StudyPackPDF(FPDF):
 
 
 
+# Single-char substitutions collapsed into one translate table so each
+# string is scanned once instead of once per replacement.
+# Keys use escapes: several of these characters render identically to
+# (or are invisible next to) their ASCII replacements in an editor.
+_SAFE_TRANSLATE = str.maketrans(
+    {
+        "\u2018": "'",  # Left single quote
+        "\u2019": "'",  # Right single quote
+        "\u201c": '"',  # Left double quote
+        "\u201d": '"',  # Right double quote
+        "\u2013": "-",  # En dash
+        "\u2022": "*",  # Bullet
+        "\u00a0": " ",  # Non-breaking space
+        # Multi-char expansions: str.translate maps one codepoint to any
+        # string, so these fold into the same single pass.
+        "\u2014": "--",  # Em dash
+        "\u2026": "...",  # Ellipsis
+        "\u00b0": " degrees",  # Degree symbol
+    }
+)
+
+
+@lru_cache(maxsize=4096)
 def _safe_text(text: str) -> str:
-    """Remove or replace characters that cause encoding issues."""
+    """Remove or replace characters that cause encoding issues.
+
+    Cached because titles, option letters and similar short strings
+    repeat many times across a study pack.
+    """
     if not text:
         return ""
-    
-    # Replace common problematic characters
-    replacements = {
-        '\u2018': "'",  # Left single quote
-        '\u2019': "'",  # Right single quote
-        '\u201c': '"',  # Left double quote
-        '\u201d': '"',  # Right double quote
-        '\u2013': '-',  # En dash
-        '\u2014': '--', # Em dash
-        '\u2022': '*',  # Bullet
-        '\u2026': '...', # Ellipsis
-        '\u00a0': ' ',  # Non-breaking space
-        '\u2019': "'",  # Another quote variant
-        '\u00b0': ' degrees',  # Degree symbol
-    }
-    
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    
-    # Try to encode to Latin-1, if it fails, use ASCII with ignore
-    try:
-        return text.encode('latin-1', 'ignore').decode('latin-1')
-    except Exception:
-        # Fallback: keep only ASCII characters
-        return ''.join(char if ord(char) < 128 else '?' for char in text)
+
+    text = text.translate(_SAFE_TRANSLATE)
+    # Drop anything that still falls outside Latin-1 (fpdf's core fonts).
+    return text.encode("latin-1", "ignore").decode("latin-1")
 
 
+_TOC_ITEMS = [
+    "1. Topic Weightage Overview",
+    "2. Summaries (Short + Detailed)",
+    "3. MCQs by Chapter",
+    "4. Revision Notes",
+]
+
+_INTRO_TEXT = (
+    "This auto-generated study pack summarizes your uploaded material, "
+    "highlights important topics, and provides MCQs and revision notes."
+)
+
+
+def _page_decorations(canvas, doc) -> None:
+    """Draw the running header and page-number footer (reportlab)."""
+
+    canvas.saveState()
+    width, height = doc.pagesize
+    canvas.setFont("Helvetica-Bold", 14)
+    canvas.drawCentredString(width / 2, height - 15 * mm, "Smart Study Assistant - Study Pack")
+    canvas.setFont("Helvetica", 8)
+    canvas.drawCentredString(width / 2, 10 * mm, f"Page {doc.page}")
+    canvas.restoreState()
+
 
 class FinalReportAgent:
     """Agent that builds the final PDF from intermediate artifacts."""
@@ -69,6 +120,130 @@ class FinalReportAgent:
         summaries: Dict[str, Any],
         mcqs: List[Dict[str, Any]],
         notes: Dict[str, Any],
+    ) -> bytes:
+        if _HAS_REPORTLAB:
+            return self._build_pdf_reportlab(
+                topics=topics, summaries=summaries, mcqs=mcqs, notes=notes
+            )
+        return self._build_pdf_fpdf(
+            topics=topics, summaries=summaries, mcqs=mcqs, notes=notes
+        )
+
+    # ------------------------------------------------------------------
+    # reportlab implementation (preferred)
+    # ------------------------------------------------------------------
+    def _build_pdf_reportlab(
+        self,
+        *,
+        topics: List[Dict[str, Any]],
+        summaries: Dict[str, Any],
+        mcqs: List[Dict[str, Any]],
+        notes: Dict[str, Any],
+    ) -> bytes:
+        styles = getSampleStyleSheet()
+        body = ParagraphStyle("Body", parent=styles["Normal"], fontSize=11, leading=14)
+        small = ParagraphStyle("Small", parent=body, fontSize=10, leading=12)
+        italic = ParagraphStyle("SmallItalic", parent=small, fontName="Helvetica-Oblique")
+        section = ParagraphStyle(
+            "Section", parent=styles["Heading1"], fontSize=14, spaceAfter=8
+        )
+        subsection = ParagraphStyle(
+            "Subsection", parent=styles["Heading2"], fontSize=12, spaceAfter=4
+        )
+
+        def para(text: str, style: ParagraphStyle = body) -> Paragraph:
+            return Paragraph(escape(_safe_text(text)).replace("\n", "<br/>"), style)
+
+        flowables: list = []
+
+        # Title page
+        flowables.append(
+            para("Smart Study Assistant - Multi-Agent PDF Analyzer", styles["Title"])
+        )
+        flowables.append(Spacer(1, 4 * mm))
+        flowables.append(para(_INTRO_TEXT))
+        flowables.append(Spacer(1, 6 * mm))
+        flowables.append(para("Table of Contents", subsection))
+        for item in _TOC_ITEMS:
+            flowables.append(para(f"- {item}"))
+
+        # Section 1: Topic Weightage
+        flowables.append(PageBreak())
+        flowables.append(para("1. Topic Weightage Overview", section))
+        if not topics:
+            flowables.append(para("No topics detected."))
+        else:
+            for topic in topics:
+                flowables.append(
+                    para(
+                        f"[{topic['weightage']}] {topic['title']} "
+                        f"(score={topic['score']:.3f})"
+                    )
+                )
+                if topic.get("snippet"):
+                    flowables.append(para(f"Snippet: {topic['snippet'][:300]}...", small))
+                flowables.append(Spacer(1, 2 * mm))
+
+        # Section 2: Summaries
+        flowables.append(PageBreak())
+        flowables.append(para("2. Summaries", section))
+        flowables.append(para("Short Summary", subsection))
+        flowables.append(para(summaries.get("short_summary", "Not available.")))
+        flowables.append(Spacer(1, 4 * mm))
+        flowables.append(para("Detailed Summary", subsection))
+        flowables.append(para(summaries.get("detailed_summary", "Not available.")))
+
+        # Section 3: MCQs
+        flowables.append(PageBreak())
+        flowables.append(para("3. MCQs by Chapter", section))
+        if not mcqs:
+            flowables.append(para("No MCQs generated."))
+        else:
+            for chapter_mcqs in mcqs:
+                flowables.append(Spacer(1, 3 * mm))
+                flowables.append(
+                    para(f"Chapter: {chapter_mcqs.get('title', 'Untitled')}", subsection)
+                )
+                for idx, item in enumerate(chapter_mcqs.get("mcqs", []), start=1):
+                    flowables.append(para(f"Q{idx}. {item.get('question', '')}"))
+                    options = item.get("options", [])
+                    for opt_idx, opt in zip(["A", "B", "C", "D"], options):
+                        flowables.append(para(f"   {opt_idx}) {opt}", small))
+                    flowables.append(para(f"Answer: {item.get('answer', '')}", italic))
+                    explanation = item.get("explanation", "")
+                    if explanation:
+                        flowables.append(para(f"Explanation: {explanation}", italic))
+                    flowables.append(Spacer(1, 2 * mm))
+
+        # Section 4: Revision Notes
+        flowables.append(PageBreak())
+        flowables.append(para("4. Revision Notes", section))
+        flowables.append(para(notes.get("notes_markdown", "No notes generated.")))
+
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=A4,
+            topMargin=25 * mm,
+            bottomMargin=18 * mm,
+        )
+        doc.build(
+            flowables,
+            onFirstPage=_page_decorations,
+            onLaterPages=_page_decorations,
+        )
+        return buffer.getvalue()
+
+    # ------------------------------------------------------------------
+    # fpdf fallback (original implementation)
+    # ------------------------------------------------------------------
+    def _build_pdf_fpdf(
+        self,
+        *,
+        topics: List[Dict[str, Any]],
+        summaries: Dict[str, Any],
+        mcqs: List[Dict[str, Any]],
+        notes: Dict[str, Any],
     ) -> bytes:
         pdf = _StudyPackPDF()
         pdf.set_auto_page_break(auto=True, margin=15)
@@ -80,25 +255,14 @@ class FinalReportAgent:
         pdf.ln(4)
 
         pdf.set_font("Arial", size=11)
-        pdf.multi_cell(
-            0,
-            6,
-            "This auto-generated study pack summarizes your uploaded material, "
-            "highlights important topics, and provides MCQs and revision notes.",
-        )
+        pdf.multi_cell(0, 6, _INTRO_TEXT)
 
         # Table of Contents (simple, not page-linked)
         pdf.ln(6)
         pdf.set_font("Arial", "B", 13)
         pdf.cell(0, 8, "Table of Contents", ln=1)
         pdf.set_font("Arial", size=11)
-        toc_items = [
-            "1. Topic Weightage Overview",
-            "2. Summaries (Short + Detailed)",
-            "3. MCQs by Chapter",
-            "4. Revision Notes",
-        ]
-        for item in toc_items:
+        for item in _TOC_ITEMS:
             pdf.cell(0, 6, f"- {item}", ln=1)
 
         # Section 1: Topic Weightage
@@ -169,6 +333,6 @@ class FinalReportAgent:
         notes_md = notes.get("notes_markdown", "No notes generated.")
         pdf.multi_cell(0, 6, _safe_text(notes_md))
 
-        buffer = BytesIO()
-        pdf.output(buffer)
-        return buffer.getvalue()
+        # fpdf2 returns the serialized document directly; no need to
+        # round-trip through a BytesIO buffer.
+        return bytes(pdf.output())
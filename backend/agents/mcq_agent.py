@@ -9,84 +9,284 @@ Creates 10+ MCQs per chapter, each with:
 
 from __future__ import annotations
 
+import asyncio
 import json
+import re
 from typing import List, Dict, Any
 
-from backend.models.llm import LLMClient
+import orjson
+
+from backend.models.llm import get_llm_client
+from backend.utils.text_budget import estimate_tokens, trim_to_token_budget
+
+# Strips leading/trailing markdown code fences (```json ... ```).
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.MULTILINE)
+
+# Cap concurrent LLM calls so we stay within provider rate limits.
+MAX_CONCURRENT_REQUESTS = 5
+
+# Content budget per chapter within a prompt.
+CHAPTER_TOKEN_BUDGET = 1500
+
+# Combined content budget for batching several small chapters into one
+# LLM call; batching amortizes the fixed prompt/RTT overhead per request.
+BATCH_TOKEN_BUDGET = 4000
+
+# Output tokens reserved per chapter (10 MCQs with explanations).
+CHAPTER_OUTPUT_TOKENS = 2048
+
+# Smallest output cap among the supported providers (Gemini: 8192);
+# requesting more either errors or truncates the JSON mid-object. This
+# also bounds how many chapters may share one batch.
+MAX_OUTPUT_TOKENS = 8192
+
+_FORMAT_INSTRUCTIONS = (
+    "Return ONLY a valid JSON object, nothing else before or after. "
+    "IMPORTANT: Do not include any text before or after the JSON. "
+    "Do not include markdown code blocks or any formatting - just raw JSON.\n\n"
+)
+
+_MCQ_EXAMPLE = (
+    '    {\n'
+    '      "question": "What is the definition of X?",\n'
+    '      "options": ["Option A", "Option B", "Option C", "Option D"],\n'
+    '      "answer": "Option A",\n'
+    '      "explanation": "Brief explanation here"\n'
+    '    }\n'
+)
+
+
+def _extract_json_object(text: str) -> str | None:
+    """Return the outermost balanced {...} slice of text, or None.
+
+    Walks the string once, tracking brace depth while skipping string
+    literals and escapes, so prose before or after the JSON object does
+    not break parsing.
+    """
+
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch == '"':
+            in_string = not in_string
+        elif not in_string:
+            if ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start : i + 1]
+    return None
+
+
+def _parse_json_response(raw: str) -> Dict[str, Any]:
+    """Parse an LLM response as JSON, stripping markdown fences if present.
+
+    Raises json.JSONDecodeError (which orjson's error subclasses) when
+    no valid JSON object can be recovered.
+    """
+
+    clean_raw = _FENCE_RE.sub("", raw.strip()).strip()
+    try:
+        return orjson.loads(clean_raw)
+    except json.JSONDecodeError:
+        # The model wrapped the JSON in prose; try the outermost balanced
+        # object before giving up (a retry LLM call is far more expensive).
+        candidate = _extract_json_object(clean_raw)
+        if candidate is None:
+            raise
+        return orjson.loads(candidate)
+
+
+def _parse_error_mcqs(raw: str) -> List[Dict[str, Any]]:
+    """Placeholder MCQ list used when the LLM output cannot be parsed."""
+
+    return [
+        {
+            "question": "LLM output could not be parsed as JSON.",
+            "options": ["A) See raw output in logs", "B) ", "C) ", "D) "],
+            "answer": "A) See raw output in logs",
+            "explanation": raw[:1000],
+        }
+    ]
 
 
 class MCQGeneratorAgent:
     """Agent that generates exam-style MCQs for each chapter."""
 
     def __init__(self) -> None:
-        self.client = LLMClient()
+        self.client = get_llm_client()
 
     def _build_prompt(self, chapter_title: str, content: str) -> str:
         return (
             "Generate 10 multiple-choice questions (MCQs) for this chapter. "
-            "Return ONLY a valid JSON object, nothing else before or after. "
-            "Use this EXACT format:\n\n"
+            + _FORMAT_INSTRUCTIONS
+            + "Use this EXACT format:\n\n"
             '```json\n'
             '{\n'
             '  "mcqs": [\n'
+            + _MCQ_EXAMPLE
+            + '  ]\n'
+            '}\n'
+            '```\n\n'
+            f"CHAPTER TITLE: {chapter_title}\n\n"
+            f"CONTENT:\n{trim_to_token_budget(content, budget_tokens=CHAPTER_TOKEN_BUDGET)}"
+        )
+
+    def _build_batch_prompt(self, chapters: List[Dict[str, Any]]) -> str:
+        sections = []
+        for i, chapter in enumerate(chapters, start=1):
+            title = chapter.get("title", "Untitled Chapter")
+            content = trim_to_token_budget(
+                chapter.get("content", ""), budget_tokens=CHAPTER_TOKEN_BUDGET
+            )
+            sections.append(f"CHAPTER {i}: {title}\nCONTENT:\n{content}")
+
+        return (
+            "Generate 10 multiple-choice questions (MCQs) for EACH of the "
+            f"{len(chapters)} chapters below. "
+            + _FORMAT_INSTRUCTIONS
+            + "Use this EXACT format, with one entry per chapter in the "
+            "same order as given:\n\n"
+            '```json\n'
+            '{\n'
+            '  "chapters": [\n'
             '    {\n'
-            '      "question": "What is the definition of X?",\n'
-            '      "options": ["Option A", "Option B", "Option C", "Option D"],\n'
-            '      "answer": "Option A",\n'
-            '      "explanation": "Brief explanation here"\n'
+            '      "title": "Chapter title here",\n'
+            '      "mcqs": [\n'
+            + _MCQ_EXAMPLE
+            + '      ]\n'
             '    }\n'
             '  ]\n'
             '}\n'
             '```\n\n'
-            "IMPORTANT: Return ONLY the JSON object. Do not include any text before or after the JSON. "
-            "Do not include markdown code blocks or any formatting - just raw JSON.\n\n"
-            f"CHAPTER TITLE: {chapter_title}\n\nCONTENT:\n{content[:6000]}"
+            + "\n\n".join(sections)
         )
 
-    def generate_for_chapter(self, chapter: Dict[str, Any]) -> Dict[str, Any]:
+    def _group_chapters(
+        self, chapters: List[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Greedily pack consecutive chapters into batches under the budget.
+
+        Chapters that alone fill the per-chapter budget get their own
+        request; small ones share a prompt to amortize fixed overhead.
+        Batch size is additionally capped so the per-chapter output
+        reservation never exceeds the provider output limit.
+        """
+
+        max_batch_len = MAX_OUTPUT_TOKENS // CHAPTER_OUTPUT_TOKENS
+
+        batches: list[list[Dict[str, Any]]] = []
+        current: list[Dict[str, Any]] = []
+        current_tokens = 0
+        for chapter in chapters:
+            cost = min(
+                estimate_tokens(chapter.get("content", "")), CHAPTER_TOKEN_BUDGET
+            )
+            if cost >= CHAPTER_TOKEN_BUDGET:
+                # Budget-filling chapters go alone, as documented.
+                if current:
+                    batches.append(current)
+                    current = []
+                    current_tokens = 0
+                batches.append([chapter])
+                continue
+            if current and (
+                current_tokens + cost > BATCH_TOKEN_BUDGET
+                or len(current) >= max_batch_len
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(chapter)
+            current_tokens += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    async def generate_for_chapter(
+        self,
+        chapter: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+    ) -> Dict[str, Any]:
         title = chapter.get("title", "Untitled Chapter")
         content = chapter.get("content", "")
 
         prompt = self._build_prompt(title, content)
-        raw = self.client.generate(prompt, max_tokens=2048, temperature=0.7)
+        # The LLM call is blocking (requests-based), so run it in a worker
+        # thread to let other chapters proceed concurrently. cache=True:
+        # retries over the same chapter rebuild the identical prompt.
+        async with semaphore:
+            raw = await asyncio.to_thread(
+                self.client.generate,
+                prompt,
+                max_tokens=CHAPTER_OUTPUT_TOKENS,
+                temperature=0.7,
+                cache=True,
+            )
 
-        # Try to parse JSON; handle markdown code blocks if present
         try:
-            # Remove markdown code blocks if present
-            clean_raw = raw.strip()
-            if clean_raw.startswith("```"):
-                # Extract content between ```json and ```
-                lines = clean_raw.split("\n")
-                json_lines = []
-                in_json = False
-                for line in lines:
-                    if line.strip().startswith("```"):
-                        if not in_json:
-                            in_json = True
-                        else:
-                            break
-                    elif in_json:
-                        json_lines.append(line)
-                clean_raw = "\n".join(json_lines)
-            
-            data = json.loads(clean_raw)
+            data = _parse_json_response(raw)
             mcqs = data.get("mcqs", [])
         except json.JSONDecodeError as e:
             print(f"❌ JSON Parse Error for chapter '{title}': {e}")
             print(f"Raw LLM output: {raw[:500]}...")
-            mcqs = [
-                {
-                    "question": "LLM output could not be parsed as JSON.",
-                    "options": ["A) See raw output in logs", "B) ", "C) ", "D) "],
-                    "answer": "A) See raw output in logs",
-                    "explanation": raw[:1000],
-                }
-            ]
+            mcqs = _parse_error_mcqs(raw)
 
         return {"title": title, "mcqs": mcqs}
 
-    def run(self, chapters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        results: list[Dict[str, Any]] = []
-        for chapter in chapters:
-            results.append(self.generate_for_chapter(chapter))
+    async def generate_for_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+    ) -> List[Dict[str, Any]]:
+        if len(batch) == 1:
+            return [await self.generate_for_chapter(batch[0], semaphore)]
+
+        titles = [c.get("title", "Untitled Chapter") for c in batch]
+        prompt = self._build_batch_prompt(batch)
+        async with semaphore:
+            raw = await asyncio.to_thread(
+                self.client.generate,
+                prompt,
+                max_tokens=min(CHAPTER_OUTPUT_TOKENS * len(batch), MAX_OUTPUT_TOKENS),
+                temperature=0.7,
+                cache=True,
+            )
+
+        try:
+            data = _parse_json_response(raw)
+            entries = data.get("chapters", [])
+        except json.JSONDecodeError as e:
+            print(f"❌ JSON Parse Error for batch {titles}: {e}")
+            print(f"Raw LLM output: {raw[:500]}...")
+            return [{"title": t, "mcqs": _parse_error_mcqs(raw)} for t in titles]
+
+        # Trust our own titles and the requested ordering; pad with empty
+        # MCQ lists if the model returned fewer entries than chapters.
+        results = []
+        for i, title in enumerate(titles):
+            entry = entries[i] if i < len(entries) else {}
+            results.append({"title": title, "mcqs": entry.get("mcqs", [])})
         return results
+
+    async def run(self, chapters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Pack small chapters into shared prompts, then run the batches
+        # concurrently; total wall time becomes roughly max(latency)
+        # instead of sum(latencies).
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        batches = self._group_chapters(chapters)
+        batch_results = await asyncio.gather(
+            *(self.generate_for_batch(batch, semaphore) for batch in batches)
+        )
+        return [result for batch in batch_results for result in batch]
@@ -8,14 +8,15 @@ from __future__ import annotations
 
 from typing import Dict, Any
 
-from backend.models.llm import LLMClient
+from backend.models.llm import get_llm_client
+from backend.utils.text_budget import trim_to_token_budget
 
 
 class NotesGeneratorAgent:
     """Agent that generates structured study notes from content."""
 
     def __init__(self) -> None:
-        self.client = LLMClient()
+        self.client = get_llm_client()
 
     def run(self, text: str) -> Dict[str, Any]:
         system_prompt = (
@@ -30,14 +31,16 @@ class NotesGeneratorAgent:
             "- Short Q/A pairs (question : answer)\n"
             "- If useful, small markdown-style tables for comparisons.\n\n"
             "Use clear headings and markdown where appropriate.\n\n"
-            f"CONTENT:\n{text[:8000]}"
+            f"CONTENT:\n{trim_to_token_budget(text, budget_tokens=2000)}"
         )
 
+        # cache=True: retrying this step reissues the identical prompt.
         notes = self.client.generate(
             prompt,
             system_prompt=system_prompt,
             max_tokens=1024,
             temperature=0.5,
+            cache=True,
         )
 
         return {"notes_markdown": notes.strip()}
@@ -6,18 +6,20 @@ of the extracted document using the configured LLM provider.
 
 from __future__ import annotations
 
+import asyncio
 from typing import Dict, Any
 
-from backend.models.llm import LLMClient
+from backend.models.llm import get_llm_client
+from backend.utils.text_budget import trim_to_token_budget
 
 
 class SummaryAgent:
     """Agent that generates multi-granularity summaries."""
 
     def __init__(self) -> None:
-        self.client = LLMClient()
+        self.client = get_llm_client()
 
-    def run(self, text: str) -> Dict[str, Any]:
+    async def run(self, text: str) -> Dict[str, Any]:
         system_prompt = (
             "You are an expert study assistant. You write clear, concise "
             "summaries tailored for students preparing for exams."
@@ -26,28 +28,37 @@ class SummaryAgent:
         short_prompt = (
             "Write a very short summary of the following content "
             "in 3–5 bullet points. Focus on the core ideas only.\n\n"
-            f"CONTENT:\n{text[:6000]}"
+            f"CONTENT:\n{trim_to_token_budget(text, budget_tokens=1500)}"
         )
 
         detailed_prompt = (
             "Write a detailed study summary (200–300 words) of the "
             "following content. Use clear paragraphs and keep the "
             "tone student-friendly.\n\n"
-            f"CONTENT:\n{text[:8000]}"
+            f"CONTENT:\n{trim_to_token_budget(text, budget_tokens=2000)}"
         )
 
-        short_summary = self.client.generate(
-            short_prompt,
-            system_prompt=system_prompt,
-            max_tokens=256,
-            temperature=0.4,
-        )
-
-        detailed_summary = self.client.generate(
-            detailed_prompt,
-            system_prompt=system_prompt,
-            max_tokens=512,
-            temperature=0.5,
+        # The two prompts are independent, so issue both LLM calls in
+        # parallel worker threads instead of serializing them. cache=True:
+        # a retried step or re-uploaded PDF rebuilds the exact same
+        # prompt, so serve it from the prompt cache instead of the API.
+        short_summary, detailed_summary = await asyncio.gather(
+            asyncio.to_thread(
+                self.client.generate,
+                short_prompt,
+                system_prompt=system_prompt,
+                max_tokens=256,
+                temperature=0.4,
+                cache=True,
+            ),
+            asyncio.to_thread(
+                self.client.generate,
+                detailed_prompt,
+                system_prompt=system_prompt,
+                max_tokens=512,
+                temperature=0.5,
+                cache=True,
+            ),
         )
 
         return {
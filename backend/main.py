@@ -6,20 +6,24 @@ Endpoints
 - POST /process          : Run extraction + topic prioritization
 - POST /generate_summary : Generate short + detailed summaries
 - POST /generate_mcq     : Generate MCQs per chapter
+- POST /generate_all     : Run summaries + MCQs + notes concurrently
 - GET  /final_pdf        : Download final compiled Study Pack PDF
 """
 
 from __future__ import annotations
 
+import asyncio
 import os
 import uuid
 from pathlib import Path
 from typing import Dict, Any
 
+import aiofiles
 from dotenv import load_dotenv
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 # Load environment variables from .env file
 load_dotenv()
@@ -30,6 +34,7 @@ from backend.agents.summary_agent import SummaryAgent
 from backend.agents.mcq_agent import MCQGeneratorAgent
 from backend.agents.notes_agent import NotesGeneratorAgent
 from backend.agents.final_agent import FinalReportAgent
+from backend.utils.session_store import SessionStore
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -37,10 +42,25 @@ UPLOAD_DIR = BASE_DIR / "uploads"
 UPLOAD_DIR.mkdir(exist_ok=True)
 
 
-app = FastAPI(title="Smart Study Assistant – Multi-Agent PDF Analyzer")
+# orjson (Rust) serializes these large text payloads several times
+# faster than the stdlib json encoder.
+app = FastAPI(
+    title="Smart Study Assistant – Multi-Agent PDF Analyzer",
+    default_response_class=ORJSONResponse,
+)
+
+# Session state lives in Redis when REDIS_URL is set (multi-worker safe,
+# TTL-expired) and in-process otherwise; see backend/utils/session_store.
+SESSION_STORE = SessionStore()
 
-# Simple in-memory session store; fine for demo / academic projects.
-SESSIONS: dict[str, Dict[str, Any]] = {}
+# Agents are stateless between calls, so build them once instead of per
+# request; this also keeps the shared LLM client's connection pool warm.
+_EXTRACTOR = PDFExtractionAgent()
+_TOPIC_AGENT = TopicPrioritizationAgent()
+_SUMMARY_AGENT = SummaryAgent()
+_MCQ_AGENT = MCQGeneratorAgent()
+_NOTES_AGENT = NotesGeneratorAgent()
+_FINAL_AGENT = FinalReportAgent()
 
 
 # Enable CORS for local dev and simple deployments
@@ -53,6 +73,10 @@ origins = [
     "*",  # widen if needed for Render/frontend hosting
 ]
 
+# Extracted text and generated JSON compress extremely well; gzip cuts
+# bytes-on-wire by ~5-10x for responses over 1 KiB.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -70,7 +94,7 @@ async def root() -> Dict[str, str]:
 
 
 @app.post("/upload")
-async def upload_pdf(file: UploadFile = File(...)) -> JSONResponse:
+async def upload_pdf(file: UploadFile = File(...)) -> ORJSONResponse:
     """Upload a PDF and create a processing session.
 
     Returns a session_id that the frontend can use for subsequent
@@ -85,19 +109,22 @@ async def upload_pdf(file: UploadFile = File(...)) -> JSONResponse:
     session_dir.mkdir(parents=True, exist_ok=True)
 
     pdf_path = session_dir / file.filename
-    content = await file.read()
-    pdf_path.write_bytes(content)
+    # Stream the upload to disk in 1 MiB chunks so peak memory stays
+    # constant instead of growing with the PDF size.
+    async with aiofiles.open(pdf_path, "wb") as out:
+        while chunk := await file.read(1 << 20):
+            await out.write(chunk)
 
-    SESSIONS[session_id] = {"pdf_path": str(pdf_path)}
+    await SESSION_STORE.update(session_id, pdf_path=str(pdf_path))
 
-    return JSONResponse({"session_id": session_id, "filename": file.filename})
+    return ORJSONResponse({"session_id": session_id, "filename": file.filename})
 
 
 @app.post("/process")
-async def process_pdf(session_id: str) -> JSONResponse:
+async def process_pdf(session_id: str) -> ORJSONResponse:
     """Run PDF extraction and topic prioritization for a given session."""
 
-    session = SESSIONS.get(session_id)
+    session = await SESSION_STORE.get(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found.")
 
@@ -105,23 +132,29 @@ async def process_pdf(session_id: str) -> JSONResponse:
     if not pdf_path:
         raise HTTPException(status_code=400, detail="No PDF uploaded for this session.")
 
-    extractor = PDFExtractionAgent()
-    topic_agent = TopicPrioritizationAgent()
-
-    extracted = extractor.run(pdf_path)
-    topics = topic_agent.run(extracted["chapters"])
-
-    session["extracted"] = extracted
-    session["topics"] = topics
-
-    return JSONResponse({"extracted": extracted, "topics": topics})
+    extracted = _EXTRACTOR.run(pdf_path)
+    topics = _TOPIC_AGENT.run(extracted["chapters"])
+
+    await SESSION_STORE.update(session_id, extracted=extracted, topics=topics)
+
+    # raw_text stays in the session but is omitted from the response;
+    # clients only need the cleaned text and chapters, halving payload.
+    return ORJSONResponse(
+        {
+            "extracted": {
+                "clean_text": extracted["clean_text"],
+                "chapters": extracted["chapters"],
+            },
+            "topics": topics,
+        }
+    )
 
 
 @app.post("/generate_summary")
-async def generate_summary(session_id: str) -> JSONResponse:
+async def generate_summary(session_id: str) -> ORJSONResponse:
     """Generate short and detailed summaries for the session content."""
 
-    session = SESSIONS.get(session_id)
+    session = await SESSION_STORE.get(session_id)
     if not session or "extracted" not in session:
         raise HTTPException(status_code=400, detail="Run /process first for this session.")
 
@@ -130,18 +163,17 @@ async def generate_summary(session_id: str) -> JSONResponse:
     if not text:
         raise HTTPException(status_code=400, detail="No text available for summarization.")
 
-    agent = SummaryAgent()
-    summaries = agent.run(text)
-    session["summaries"] = summaries
+    summaries = await _SUMMARY_AGENT.run(text)
+    await SESSION_STORE.update(session_id, summaries=summaries)
 
-    return JSONResponse({"summaries": summaries})
+    return ORJSONResponse({"summaries": summaries})
 
 
 @app.post("/generate_mcq")
-async def generate_mcq(session_id: str) -> JSONResponse:
+async def generate_mcq(session_id: str) -> ORJSONResponse:
     """Generate MCQs per chapter for the current session."""
 
-    session = SESSIONS.get(session_id)
+    session = await SESSION_STORE.get(session_id)
     if not session or "extracted" not in session:
         raise HTTPException(status_code=400, detail="Run /process first for this session.")
 
@@ -149,18 +181,17 @@ async def generate_mcq(session_id: str) -> JSONResponse:
     if not chapters:
         raise HTTPException(status_code=400, detail="No chapters available for MCQ generation.")
 
-    agent = MCQGeneratorAgent()
-    mcqs = agent.run(chapters)
-    session["mcqs"] = mcqs
+    mcqs = await _MCQ_AGENT.run(chapters)
+    await SESSION_STORE.update(session_id, mcqs=mcqs)
 
-    return JSONResponse({"mcqs": mcqs})
+    return ORJSONResponse({"mcqs": mcqs})
 
 
 @app.post("/generate_notes")
-async def generate_notes(session_id: str) -> JSONResponse:
+async def generate_notes(session_id: str) -> ORJSONResponse:
     """Generate structured revision notes for the session."""
 
-    session = SESSIONS.get(session_id)
+    session = await SESSION_STORE.get(session_id)
     if not session or "extracted" not in session:
         raise HTTPException(status_code=400, detail="Run /process first for this session.")
 
@@ -169,18 +200,50 @@ async def generate_notes(session_id: str) -> JSONResponse:
     if not text:
         raise HTTPException(status_code=400, detail="No text available for notes generation.")
 
-    agent = NotesGeneratorAgent()
-    notes = agent.run(text)
-    session["notes"] = notes
+    notes = _NOTES_AGENT.run(text)
+    await SESSION_STORE.update(session_id, notes=notes)
+
+    return ORJSONResponse({"notes": notes})
+
+
+@app.post("/generate_all")
+async def generate_all(session_id: str) -> ORJSONResponse:
+    """Generate summaries, MCQs and notes for the session in one call.
+
+    The three generation stages are independent and LLM-bound, so they
+    run concurrently; total latency is the slowest stage rather than the
+    sum of all three.
+    """
+
+    session = await SESSION_STORE.get(session_id)
+    if not session or "extracted" not in session:
+        raise HTTPException(status_code=400, detail="Run /process first for this session.")
+
+    extracted = session["extracted"]
+    text = extracted.get("clean_text") or extracted.get("raw_text")
+    if not text:
+        raise HTTPException(status_code=400, detail="No text available for generation.")
+    chapters = extracted.get("chapters", [])
+    if not chapters:
+        raise HTTPException(status_code=400, detail="No chapters available for MCQ generation.")
+
+    summaries, mcqs, notes = await asyncio.gather(
+        _SUMMARY_AGENT.run(text),
+        _MCQ_AGENT.run(chapters),
+        asyncio.to_thread(_NOTES_AGENT.run, text),
+    )
+    await SESSION_STORE.update(
+        session_id, summaries=summaries, mcqs=mcqs, notes=notes
+    )
 
-    return JSONResponse({"notes": notes})
+    return ORJSONResponse({"summaries": summaries, "mcqs": mcqs, "notes": notes})
 
 
 @app.get("/final_pdf")
 async def final_pdf(session_id: str) -> StreamingResponse:
     """Build and stream the final Study Pack PDF for download."""
 
-    session = SESSIONS.get(session_id)
+    session = await SESSION_STORE.get(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found.")
 
@@ -195,8 +258,7 @@ async def final_pdf(session_id: str) -> StreamingResponse:
             detail="Please run /process, /generate_summary, /generate_mcq and /generate_notes first.",
         )
 
-    agent = FinalReportAgent()
-    pdf_bytes = agent.build_pdf(
+    pdf_bytes = _FINAL_AGENT.build_pdf(
         topics=topics,
         summaries=summaries,
         mcqs=mcqs,
@@ -14,18 +14,48 @@ hard-coded:
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+from functools import lru_cache
 from typing import Optional
 
 import requests
 
 
+# Only cache near-deterministic generations by default; at higher
+# temperatures callers expect fresh stochastic output.
+_CACHE_TEMPERATURE_CUTOFF = 0.2
+
+
+@lru_cache(maxsize=1)
+def get_llm_client() -> "LLMClient":
+    """Return the shared LLMClient instance.
+
+    Agents should use this instead of constructing their own client so
+    the connection pool (and any future caches) is reused across requests.
+    """
+
+    return LLMClient()
+
+
 class LLMClient:
     """Thin wrapper around multiple free LLM providers."""
 
     def __init__(self) -> None:
         self.provider = os.getenv("LLM_PROVIDER", "gemini").lower()
+        # Reuse one session for all provider calls so TCP/TLS connections
+        # stay warm instead of paying a new handshake per request. Pool
+        # sizes are generous enough for concurrent per-chapter calls.
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # Exact-match prompt cache: identical prompts (e.g. a re-uploaded
+        # PDF or a retried step) skip the network call entirely.
+        self._cache: dict[str, str] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     # ------------------------------------------------------------------
     # Public API
@@ -37,18 +67,51 @@ class LLMClient:
         system_prompt: Optional[str] = None,
         max_tokens: int = 1024,
         temperature: float = 0.4,
+        cache: Optional[bool] = None,
     ) -> str:
         """Generate a completion for the given prompt.
 
-        The exact API call depends on the provider selected.
+        The exact API call depends on the provider selected. Identical
+        prompts are served from an in-memory cache when ``cache=True``
+        is passed, or automatically at low temperatures.
         """
 
+        use_cache = (
+            cache if cache is not None else temperature <= _CACHE_TEMPERATURE_CUTOFF
+        )
+        key = ""
+        if use_cache:
+            key = self._cache_key(prompt, system_prompt, max_tokens, temperature)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
+
         if self.provider == "deepseek":
-            return self._generate_deepseek(prompt, system_prompt, max_tokens, temperature)
-        if self.provider == "llama":
-            return self._generate_llama_hf(prompt, system_prompt, max_tokens, temperature)
-        # Default to Gemini
-        return self._generate_gemini(prompt, system_prompt, max_tokens, temperature)
+            result = self._generate_deepseek(prompt, system_prompt, max_tokens, temperature)
+        elif self.provider == "llama":
+            result = self._generate_llama_hf(prompt, system_prompt, max_tokens, temperature)
+        else:
+            # Default to Gemini
+            result = self._generate_gemini(prompt, system_prompt, max_tokens, temperature)
+
+        if use_cache:
+            self._cache[key] = result
+        return result
+
+    def _cache_key(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+    ) -> str:
+        payload = json.dumps(
+            [self.provider, system_prompt, prompt, max_tokens, temperature],
+            sort_keys=True,
+        )
+        return hashlib.blake2b(payload.encode()).hexdigest()
 
     # ------------------------------------------------------------------
     # Provider-specific implementations
@@ -83,7 +146,7 @@ class LLMClient:
             },
         }
 
-        resp = requests.post(url, headers=headers, params={"key": api_key}, json=body, timeout=60)
+        resp = self._session.post(url, headers=headers, params={"key": api_key}, json=body, timeout=60)
         resp.raise_for_status()
         data = resp.json()
         try:
@@ -120,7 +183,7 @@ class LLMClient:
             "max_tokens": max_tokens,
         }
 
-        resp = requests.post(url, headers=headers, json=body, timeout=60)
+        resp = self._session.post(url, headers=headers, json=body, timeout=60)
         
         # Debug logging
         if resp.status_code != 200:
@@ -168,7 +231,7 @@ class LLMClient:
             },
         }
 
-        resp = requests.post(url, headers=headers, data=json.dumps(body), timeout=60)
+        resp = self._session.post(url, headers=headers, data=json.dumps(body), timeout=60)
         resp.raise_for_status()
         data = resp.json()
         # HF text generation APIs typically return a list of dicts with 'generated_text'
@@ -0,0 +1,72 @@
+"""Session storage for processing sessions.
+
+Sessions were previously a module-level dict in ``main.py``, which leaks
+memory (entries never expire) and breaks under ``uvicorn --workers N``
+because each worker has its own dict. This store keeps sessions in Redis
+when ``REDIS_URL`` is set — so any worker can serve any session and keys
+expire automatically — and falls back to an in-memory dict with the same
+TTL semantics for single-process local runs.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict, Optional
+
+import orjson
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is optional
+    aioredis = None
+
+
+DEFAULT_TTL_SECONDS = 3600
+
+
+class SessionStore:
+    """Key-value store for per-session processing state."""
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> None:
+        self._ttl = ttl_seconds
+        self._redis = None
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url and aioredis is not None:
+            self._redis = aioredis.from_url(redis_url)
+        # Fallback: session_id -> (expires_at, data)
+        self._local: dict[str, tuple[float, Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"session:{session_id}"
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the session payload, or None if missing/expired."""
+
+        if self._redis is not None:
+            raw = await self._redis.get(self._key(session_id))
+            return orjson.loads(raw) if raw is not None else None
+
+        entry = self._local.get(session_id)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at < time.monotonic():
+            del self._local[session_id]
+            return None
+        return data
+
+    async def update(self, session_id: str, **fields: Any) -> Dict[str, Any]:
+        """Merge fields into the session (creating it if needed)."""
+
+        data = await self.get(session_id) or {}
+        data.update(fields)
+
+        if self._redis is not None:
+            await self._redis.set(
+                self._key(session_id), orjson.dumps(data), ex=self._ttl
+            )
+        else:
+            self._local[session_id] = (time.monotonic() + self._ttl, data)
+        return data
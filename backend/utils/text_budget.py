@@ -0,0 +1,42 @@
+"""Token-budget helpers for trimming prompt content.
+
+Agents previously truncated content with raw byte slices (``text[:6000]``),
+which cut mid-sentence and mapped poorly onto provider token limits. This
+module trims on sentence boundaries against an estimated token budget.
+"""
+
+from __future__ import annotations
+
+from backend.utils.text_cleaner import split_into_sentences
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English prose)."""
+
+    return len(text) // 4
+
+
+def trim_to_token_budget(text: str, budget_tokens: int = 4500) -> str:
+    """Trim text to a token budget, keeping whole sentences.
+
+    Accumulates sentences in order until the estimated token budget is
+    reached, so the LLM never sees a truncated half-sentence. Always
+    keeps at least the first sentence (sliced if it alone exceeds the
+    budget).
+    """
+
+    if estimate_tokens(text) <= budget_tokens:
+        return text
+
+    kept: list[str] = []
+    remaining = budget_tokens
+    for sentence in split_into_sentences(text):
+        cost = estimate_tokens(sentence) + 1  # +1 for the joining space
+        if cost > remaining:
+            break
+        kept.append(sentence)
+        remaining -= cost
+
+    if not kept:
+        return text[: budget_tokens * 4]
+    return " ".join(kept)
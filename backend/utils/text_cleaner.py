@@ -9,25 +9,132 @@ from __future__ import annotations
 import re
 from typing import List
 
+import numpy as np
 
+try:
+    # RE2 compiles to a DFA (no backtracking), which is noticeably
+    # faster than stdlib re on these simple patterns.
+    import re2 as _re2
+except ImportError:  # pragma: no cover - google-re2 is optional
+    _re2 = None
+
+
+def _compile(pattern: str):
+    """Compile with RE2 when available, falling back to stdlib re.
+
+    Only worth it for search-dominated patterns: RE2's DFA scans fast,
+    but the Python binding re-encodes the text and builds a Python
+    object per match, which makes sub/split several times slower than
+    stdlib on match-dense text. Note also that RE2's ``\\s`` is the
+    narrower ASCII-only class, and lookaround is unsupported.
+    """
+
+    if _re2 is not None:
+        try:
+            return _re2.compile(pattern)
+        except _re2.error:
+            pass
+    return re.compile(pattern)
+
+
+# All patterns are compiled once at import; these helpers run in hot
+# loops over every chapter and paragraph. The sub/split patterns stay on
+# stdlib re (see _compile).
 _whitespace_re = re.compile(r"\s+")
+_paragraph_re = re.compile(r"\n\s*\n")
+_sentence_re = re.compile(r"(?<=[.!?])\s+")
+# Detects blank lines that contain whitespace; if none exist (and there
+# are no carriage returns), paragraph breaks are plain "\n\n" runs and a
+# C-level str.split suffices.
+_blank_ws_line_re = _compile(r"\n[ \t\f\v]+\n")
+
+
+def build_clean_translator(mapping: dict[str, str]) -> dict[int, str]:
+    """Build a translate table for clean_text from a char->str mapping.
+
+    All substitutions fuse into a single C-level str.translate pass, so
+    adding entries costs nothing at runtime; callers with corpus-specific
+    artifacts can build their own table and pass it to clean_text.
+    """
+
+    return str.maketrans(mapping)
 
 
-def clean_text(text: str) -> str:
-    """Normalize whitespace and remove obvious artifacts."""
+# Default substitutions: non-breaking spaces become plain spaces (then
+# collapse with the whitespace pass), stray bullets become dashes, and
+# typographic quotes/dashes fold to their ASCII forms.
+_DEFAULT_TRANSLATOR = build_clean_translator(
+    {
+        "\xa0": " ",
+        "\u2022": "-",  # bullet
+        "\u2018": "'",
+        "\u2019": "'",
+        "\u201c": '"',
+        "\u201d": '"',
+        "\u2013": "-",  # en dash
+        "\u2014": "-",  # em dash
+    }
+)
+
+
+# Bytes below 0x80 that `\s` matches in unicode mode: the usual six plus
+# the C0 file/group/record/unit separators.
+_ASCII_WS = np.zeros(128, dtype=bool)
+_ASCII_WS[[0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x1C, 0x1D, 0x1E, 0x1F, 0x20]] = True
+
+# Below this size the encode + array setup costs more than regex saves.
+_NP_COLLAPSE_MIN_CHARS = 4096
+
+
+def _collapse_ws_ascii(text: str) -> str:
+    """Collapse whitespace runs to single spaces in one vectorized pass.
+
+    The byte-walking loop (emit one space per run, copy everything else)
+    is expressed as numpy mask arithmetic instead of a per-byte Python
+    loop: drop whitespace bytes whose predecessor is also whitespace,
+    then rewrite the surviving whitespace bytes as plain spaces.
+    """
+
+    arr = np.frombuffer(text.encode(), dtype=np.uint8)
+    ws = _ASCII_WS[arr]
+    keep = np.empty_like(ws)
+    keep[0] = True
+    np.logical_or(~ws[1:], ~ws[:-1], out=keep[1:])
+    out = arr[keep]
+    out[ws[keep]] = 0x20
+    return out.tobytes().decode()
+
+
+def clean_text(text: str, translator: dict[int, str] | None = None) -> str:
+    """Normalize whitespace and remove obvious artifacts.
+
+    translator defaults to _DEFAULT_TRANSLATOR; build a custom one with
+    build_clean_translator to handle corpus-specific artifacts.
+    """
 
-    text = text.replace("\u00a0", " ")  # non-breaking spaces
-    text = _whitespace_re.sub(" ", text)
-    # Normalize stray bullet characters
-    text = text.replace("\u2022", "-")
-    return text.strip()
+    # Two scans total (translate + whitespace collapse) instead of four,
+    # with no extra intermediate string allocations.
+    text = text.translate(translator or _DEFAULT_TRANSLATOR)
+    # Large ASCII inputs (the common case for extracted PDF text) take
+    # the vectorized collapser; everything else stays on the regex.
+    if len(text) >= _NP_COLLAPSE_MIN_CHARS and text.isascii():
+        return _collapse_ws_ascii(text).strip()
+    return _whitespace_re.sub(" ", text).strip()
 
 
 def split_into_paragraphs(text: str) -> List[str]:
     """Split text into paragraphs by blank lines."""
 
-    parts = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
-    return parts
+    # Fast path: when separators are pure "\n\n" runs, str.split is
+    # several times faster than the regex engine. The strip/filter below
+    # makes consecutive-newline runs behave identically on both paths.
+    if "\r" not in text and not _blank_ws_line_re.search(text):
+        parts_raw = text.split("\n\n")
+    else:
+        parts_raw = _paragraph_re.split(text)
+    # Strip once per part; the walrus keeps the stripped copy for the
+    # truthiness filter instead of stripping a second time.
+    return [s for p in parts_raw if (s := p.strip())]
 
 
 def split_into_sentences(text: str) -> List[str]:
@@ -38,5 +145,4 @@ def split_into_sentences(text: str) -> List[str]:
     """
 
     # Split on ., ?, ! followed by space or end-of-string
-    sentences = re.split(r"(?<=[.!?])\s+", text)
-    return [s.strip() for s in sentences if s.strip()]
+    return [s for part in _sentence_re.split(text) if (s := part.strip())]